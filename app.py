@@ -1,10 +1,12 @@
 import os
 import json
+import asyncio
+import atexit
 import re
 from typing import List, Dict, Any
 
 import requests
-from neo4j import GraphDatabase
+from neo4j import AsyncDriver, AsyncGraphDatabase, GraphDatabase
 
 from intent import classify_intent_and_entities
 from cypher_builder import build_queries
@@ -20,6 +22,7 @@ NEO4J_URI = get_env("NEO4J_URI", "neo4j://127.0.0.1:7687")
 NEO4J_USER = get_env("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = get_env("NEO4J_PASSWORD", "12345678")
 NEO4J_DATABASE = get_env("NEO4J_DATABASE", "neo4j")
+NEO4J_MAX_POOL_SIZE = int(get_env("NEO4J_MAX_POOL_SIZE", "100"))
 
 OLLAMA_API_URL = get_env("OLLAMA_API_URL", "http://127.0.0.1:11434/api/generate")
 OLLAMA_MODEL = get_env("OLLAMA_MODEL", "qwen2:7b")
@@ -38,6 +41,61 @@ class Neo4jClient:
             return [record.data() for record in result]
 
 
+async def run_specs(driver: AsyncDriver, specs: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    # Sessions are not concurrency-safe, so each spec gets its own session
+    # (and pooled connection) and the queries run in parallel.
+    async def run_one(spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+        async with driver.session(database=NEO4J_DATABASE) as session:
+            result = await session.run(spec["query"], spec.get("params") or {})
+            return await result.data()
+
+    # Let every query settle before raising, so no sibling is still using a
+    # connection when the caller goes on to close the driver.
+    results = await asyncio.gather(*(run_one(spec) for spec in specs), return_exceptions=True)
+    for res in results:
+        if isinstance(res, BaseException):
+            raise res
+    return list(results)
+
+
+# The async driver and its connection pool are shared by every question. The
+# pool's connections belong to the event loop they were opened on, so that loop
+# is kept alongside the driver instead of using a fresh asyncio.run() per call.
+_async_loop: asyncio.AbstractEventLoop | None = None
+_async_driver: AsyncDriver | None = None
+
+
+def get_async_driver() -> AsyncDriver:
+    global _async_driver
+    if _async_driver is None:
+        _async_driver = AsyncGraphDatabase.driver(
+            NEO4J_URI,
+            auth=(NEO4J_USER, NEO4J_PASSWORD),
+            max_connection_pool_size=NEO4J_MAX_POOL_SIZE,
+        )
+    return _async_driver
+
+
+def fetch_specs(specs: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    global _async_loop
+    if _async_loop is None:
+        _async_loop = asyncio.new_event_loop()
+    return _async_loop.run_until_complete(run_specs(get_async_driver(), specs))
+
+
+def close_async_driver() -> None:
+    global _async_loop, _async_driver
+    if _async_driver is not None:
+        _async_loop.run_until_complete(_async_driver.close())
+        _async_driver = None
+    if _async_loop is not None:
+        _async_loop.close()
+        _async_loop = None
+
+
+atexit.register(close_async_driver)
+
+
 def sanitize_question(question: str) -> str:
     return question.strip()
 
@@ -71,7 +129,7 @@ def retrieve_graph_context(db: Neo4jClient, question: str, limit: int = 12) -> D
     query_sections = (
         """
         MATCH (s:Section)
-        WHERE toLower(s.text) CONTAINS toLower($q)
+        WHERE s.text_lower CONTAINS toLower($q)
         WITH s LIMIT $limit
         OPTIONAL MATCH (s)-[r]-(n)
         WITH s, collect(distinct {rel:type(r), otherLabels:labels(n), otherName: coalesce(n.name, n.title, n.full_name)}) AS rels
@@ -329,38 +387,36 @@ def answer(question: str) -> str:
     # 2) build queries
     specs = build_queries(intent=intent, entities=entities, question_text=question)
 
-    db = Neo4jClient(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD)
-    try:
-        all_scored: List[Dict[str, Any]] = []
-        context_lines: List[str] = []
-        for spec in specs:
-            rows = db.run(spec["query"], spec.get("params") or {})
-            scored = score_items(question, spec["tag"], rows, entities)
-            top = select_top_n(scored, n=8)
-            if top:
-                context_lines.append(f"[{spec['tag']}]")
-                for r in top:
-                    if spec["tag"] in {"Symptoms","RiskFactors","DiagnosticTechniques","CancerTypes"} and r.get("item"):
-                        context_lines.append(f"- {r['item']}")
-                    elif spec["tag"] == "Dataset":
-                        parts = []
-                        for k in ["name","source","instances","features","format"]:
-                            if r.get(k) is not None:
-                                parts.append(f"{k}={r.get(k)}")
-                        if parts:
-                            context_lines.append("; ".join(parts))
-                    elif spec["tag"] == "Results":
-                        context_lines.append(f"- {r.get('model')}: {r.get('metric')} = {r.get('accuracy')}")
-                    elif spec["tag"] == "BestModel":
-                        if r.get('bestModel'):
-                            context_lines.append(f"- {r.get('bestModel')}")
-                    elif spec["tag"] in {"Sections","Conclusion"}:
-                        name = r.get('name') or spec["tag"]
-                        text = (r.get('text') or "").replace('\n',' ')[:400]
-                        context_lines.append(f"- {name}: {text}")
-                all_scored.extend(top)
-    finally:
-        db.close()
+    # 3) run all spec queries concurrently
+    rows_per_spec = fetch_specs(specs)
+
+    all_scored: List[Dict[str, Any]] = []
+    context_lines: List[str] = []
+    for spec, rows in zip(specs, rows_per_spec):
+        scored = score_items(question, spec["tag"], rows, entities)
+        top = select_top_n(scored, n=8)
+        if top:
+            context_lines.append(f"[{spec['tag']}]")
+            for r in top:
+                if spec["tag"] in {"Symptoms","RiskFactors","DiagnosticTechniques","CancerTypes"} and r.get("item"):
+                    context_lines.append(f"- {r['item']}")
+                elif spec["tag"] == "Dataset":
+                    parts = []
+                    for k in ["name","source","instances","features","format"]:
+                        if r.get(k) is not None:
+                            parts.append(f"{k}={r.get(k)}")
+                    if parts:
+                        context_lines.append("; ".join(parts))
+                elif spec["tag"] == "Results":
+                    context_lines.append(f"- {r.get('model')}: {r.get('metric')} = {r.get('accuracy')}")
+                elif spec["tag"] == "BestModel":
+                    if r.get('bestModel'):
+                        context_lines.append(f"- {r.get('bestModel')}")
+                elif spec["tag"] in {"Sections","Conclusion"}:
+                    name = r.get('name') or spec["tag"]
+                    text = (r.get('text') or "").replace('\n',' ')[:400]
+                    context_lines.append(f"- {name}: {text}")
+            all_scored.extend(top)
 
     # 6) build final context string
     context_str = "\n".join(context_lines)
@@ -1,6 +1,16 @@
+import re
 from typing import Dict, Any, List
 
 
+# Characters with a meaning in Lucene query syntax (used by the fulltext index).
+_LUCENE_SPECIAL = re.compile(r'([+\-!(){}\[\]^"~*?:\\/&|])')
+
+
+def _fulltext_query(text: str) -> str:
+    # Lowercase so AND/OR/NOT in the question are not read as operators.
+    return _LUCENE_SPECIAL.sub(r"\\\1", text.lower())
+
+
 def build_queries(intent: str, entities: Dict[str, List[str]], question_text: str) -> List[Dict[str, Any]]:
     specs: List[Dict[str, Any]] = []
 
@@ -48,16 +58,23 @@ def build_queries(intent: str, entities: Dict[str, List[str]], question_text: st
     elif intent == "conclusion":
         specs.append({
             "tag": "Conclusion",
-            "query": "MATCH (s:Section:Conclusion) RETURN s.name AS name, s.text AS text",
+            "query": "MATCH (s:Section:Conclusion) RETURN s.name AS name, s.text AS text, s.tokens AS tokens",
             "params": {},
         })
 
     
-    if not specs:
+    if not specs and question_text.strip():
         specs.append({
             "tag": "Sections",
-            "query": "MATCH (s:Section) WHERE toLower(s.text) CONTAINS toLower($q) RETURN s.name AS name, s.text AS text LIMIT 50",
-            "params": {"q": question_text},
+            "query": "CALL db.index.fulltext.queryNodes('section_text', $q) YIELD node AS s, score RETURN s.name AS name, s.text AS text, s.tokens AS tokens ORDER BY score DESC LIMIT 50",
+            "params": {"q": _fulltext_query(question_text)},
+        })
+    elif not specs:
+        # Lucene rejects an empty query; a blank question matches every section.
+        specs.append({
+            "tag": "Sections",
+            "query": "MATCH (s:Section) RETURN s.name AS name, s.text AS text, s.tokens AS tokens LIMIT 50",
+            "params": {},
         })
 
     return specs
@@ -1,5 +1,7 @@
 import re
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Set, Tuple
 
 
 INTENTS = {
@@ -24,42 +26,80 @@ ALGORITHM_ALIASES = {
 SECTION_NAMES = ["abstract", "introduction", "methodology", "results", "conclusion"]
 
 
+_WS = re.compile(r"\s+")
+
+# One alternation per intent, checked in INTENTS order; the first hit wins.
+_INTENT_PATTERNS = {
+    intent: re.compile("|".join(sorted(map(re.escape, kws), key=len, reverse=True)))
+    for intent, kws in INTENTS.items()
+}
+
+
+Group = Tuple[str, str]  # (entity kind, canonical name)
+
+
+def _build_scanner(groups: Dict[Group, List[str]]) -> Tuple["re.Pattern[str]", Dict[str, Tuple[Group, ...]]]:
+    """Compile every keyword of every group into one pattern scanned in a single pass.
+
+    The zero-width lookahead reports a match at each position, so overlapping
+    keywords are all seen. Only the longest alternative is reported per
+    position, hence each keyword also owns the groups of its prefixes.
+    """
+    keywords = sorted({kw for kws in groups.values() for kw in kws}, key=len, reverse=True)
+    pattern = re.compile("(?=(" + "|".join(map(re.escape, keywords)) + "))")
+    owners = {
+        kw: tuple(g for g, kws in groups.items() if any(kw.startswith(k) for k in kws))
+        for kw in keywords
+    }
+    return pattern, owners
+
+
+# Every entity keyword tagged with its kind, in output order.
+_ENTITY_GROUPS: Dict[Group, List[str]] = {
+    ("diseases", "lung cancer"): ["lung cancer"],
+    **{("algorithms", short): kws for short, kws in ALGORITHM_ALIASES.items()},
+    **{("sections", s): [s] for s in SECTION_NAMES},
+}
+_ENTITY_SCANNER = _build_scanner(_ENTITY_GROUPS)
+
+
+def _scan(scanner: Tuple["re.Pattern[str]", Dict[str, Tuple[Group, ...]]], q: str) -> Set[Group]:
+    pattern, owners = scanner
+    hits: Set[Group] = set()
+    for m in pattern.finditer(q):
+        hits.update(owners[m.group(1)])
+    return hits
+
+
+@lru_cache(maxsize=1024)
 def _normalize(text: str) -> str:
-    return re.sub(r"\s+", " ", text.lower().strip())
+    return _WS.sub(" ", text.lower().strip())
 
 
 def _detect_intent(question: str) -> str:
     q = _normalize(question)
-    for intent, keywords in INTENTS.items():
-        for kw in keywords:
-            if kw in q:
-                return intent
+    for intent, pattern in _INTENT_PATTERNS.items():
+        if pattern.search(q):
+            return intent
     return "generic"
 
 
 def _extract_entities(question: str) -> Dict[str, List[str]]:
     q = _normalize(question)
 
-    diseases: List[str] = []
-    if "lung cancer" in q:
-        diseases.append("lung cancer")
-
-    algorithms: List[str] = []
-    for short, kws in ALGORITHM_ALIASES.items():
-        if any(kw in q for kw in kws):
-            algorithms.append(short)
-
-    sections: List[str] = []
-    for s in SECTION_NAMES:
-        if s in q:
-            sections.append(s)
-
-    return {"diseases": diseases, "algorithms": algorithms, "sections": sections}
+    found = _scan(_ENTITY_SCANNER, q)
+    entities: Dict[str, List[str]] = {"diseases": [], "algorithms": [], "sections": []}
+    for kind, name in _ENTITY_GROUPS:
+        if (kind, name) in found:
+            entities[kind].append(name)
+    return entities
 
 
-def classify_intent_and_entities(question: str) -> Dict[str, object]:
+@lru_cache(maxsize=1024)
+def classify_intent_and_entities(question: str) -> Mapping[str, object]:
+    # Results are cached and shared between callers, so hand out read-only views.
     intent = _detect_intent(question)
-    entities = _extract_entities(question)
-    return {"intent": intent, "entities": entities}
+    entities = {k: tuple(v) for k, v in _extract_entities(question).items()}
+    return MappingProxyType({"intent": intent, "entities": MappingProxyType(entities)})
 
 
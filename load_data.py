@@ -1,8 +1,18 @@
 
 
-import json
+import sys
+
+import ijson
 from neo4j import GraphDatabase
 
+from ranker import text_tokens
+
+TEXT_KEYS = ('text', 'Text')
+HEADER_KEYS = ('file_path', 'file_size_human', 'page_count', 'metadata')
+
+# Algorithm, model and symptom names recur across sections; keep one copy of each
+_INTERN = sys.intern
+
 class LungCancerGraphLoader:
     def __init__(self, uri, user, password):
         """Initialize connection to Neo4j"""
@@ -16,33 +26,40 @@ class LungCancerGraphLoader:
     
     def get_text(self, section, key='text'):
         """Helper function to get text with fallback to 'Text' or 'text'"""
-        if 'text' in section:
-            return section['text']
-        elif 'Text' in section:
-            return section['Text']
+        for k in TEXT_KEYS:
+            if k in section:
+                return section[k]
         return ""
     
-    def clear_database(self):
+    def get_entities(self, section):
+        """Helper function to get the entities dict with lowercased keys"""
+        entities = section.get('entities') or section.get('Entities') or {}
+        return {k.lower(): v for k, v in entities.items()}
+    
+    def clear_database(self, tx):
         """Clear all existing data (use with caution!)"""
-        with self.driver.session() as session:
-            session.run("MATCH (n) DETACH DELETE n")
+        tx.run("MATCH (n) DETACH DELETE n")
         print("✓ Database cleared")
     
     def create_constraints(self):
-        """Create uniqueness constraints for better performance"""
+        """Create uniqueness constraints and indexes for better performance"""
         constraints = [
             "CREATE CONSTRAINT IF NOT EXISTS FOR (p:Paper) REQUIRE p.title IS UNIQUE",
             "CREATE CONSTRAINT IF NOT EXISTS FOR (s:Section) REQUIRE s.name IS UNIQUE",
             "CREATE CONSTRAINT IF NOT EXISTS FOR (a:Algorithm) REQUIRE a.name IS UNIQUE",
-            "CREATE CONSTRAINT IF NOT EXISTS FOR (m:Metric) REQUIRE m.name IS UNIQUE"
+            "CREATE CONSTRAINT IF NOT EXISTS FOR (m:Metric) REQUIRE m.name IS UNIQUE",
+            "CREATE CONSTRAINT IF NOT EXISTS FOR (r:Result) REQUIRE (r.model_name, r.metric) IS UNIQUE",
+            "CREATE FULLTEXT INDEX section_text IF NOT EXISTS FOR (s:Section) ON EACH [s.text_lower]",
+            "CREATE INDEX cancer_type_is_lung IF NOT EXISTS FOR (c:CancerType) ON (c.is_lung)",
+            "CREATE INDEX feature_name IF NOT EXISTS FOR (f:Feature) ON (f.name)"
         ]
         
         with self.driver.session() as session:
             for constraint in constraints:
                 session.run(constraint)
-        print("✓ Constraints created")
+        print("✓ Constraints and indexes created")
     
-    def load_paper_metadata(self, data):
+    def load_paper_metadata(self, tx, data):
         """Create the main research paper node"""
         query = """
         CREATE (p:Paper {
@@ -56,20 +73,18 @@ class LungCancerGraphLoader:
         RETURN p
         """
         
-        with self.driver.session() as session:
-            session.run(query, 
-                file_path=data['file_path'],
-                file_size=data['file_size_human'],
-                page_count=data['page_count'],
-                author=data['metadata']['author'],
-                creator=data['metadata']['creator'],
-                title=data['metadata'].get('title', 'Lung Cancer Detection using Supervised ML')
-            )
+        tx.run(query, 
+            file_path=data['file_path'],
+            file_size=data['file_size_human'],
+            page_count=data['page_count'],
+            author=data['metadata']['author'],
+            creator=data['metadata']['creator'],
+            title=data['metadata'].get('title', 'Lung Cancer Detection using Supervised ML')
+        )
         print("✓ Paper metadata loaded")
     
-    def load_abstract(self, paper_data):
+    def load_abstract(self, tx, abstract):
         """Load abstract section and its entities"""
-        abstract = paper_data['Sections']['Abstract']
         text = self.get_text(abstract)
         
         # Create Abstract Section
@@ -77,132 +92,128 @@ class LungCancerGraphLoader:
         MATCH (p:Paper)
         CREATE (s:Section:Abstract {
             name: 'Abstract',
-            text: $text
+            text: $text,
+            text_lower: toLower($text),
+            tokens: $tokens
         })
         CREATE (p)-[:HAS_SECTION]->(s)
         RETURN s
         """
         
-        with self.driver.session() as session:
-            session.run(query, text=text[:5000])  # Limit text length
+        text = text[:5000]  # Limit text length
+        tx.run(query, text=text, tokens=text_tokens(text))
         
         # Get entities
-        entities = abstract.get('entities', abstract.get('Entities', {}))
+        entities = self.get_entities(abstract)
         
         # Create ML Algorithms
-        if 'ML Tools' in entities:
-            algorithms = entities['ML Tools']
-        elif 'Diagnostic Techniques' in entities:
-            algorithms = entities['Diagnostic Techniques']
+        if 'ml tools' in entities:
+            algorithms = entities['ml tools']
+        elif 'diagnostic techniques' in entities:
+            algorithms = entities['diagnostic techniques']
         else:
             algorithms = ['SVM', 'ANN', 'MLR', 'Random Forest']
         
-        for algo in algorithms:
-            query = """
-            MATCH (s:Abstract)
-            MERGE (a:Algorithm {name: $algo})
-            CREATE (s)-[:MENTIONS_ALGORITHM]->(a)
-            """
-            with self.driver.session() as session:
-                if isinstance(algo, str):
-                    session.run(query, algo=algo)
+        query = """
+        MATCH (s:Abstract)
+        UNWIND $rows AS algo
+        MERGE (a:Algorithm {name: algo})
+        CREATE (s)-[:MENTIONS_ALGORITHM]->(a)
+        """
+        tx.run(query, rows=[_INTERN(a) for a in algorithms if isinstance(a, str)])
         
         # Create Keywords if available
-        keywords_text = entities.get('Keywords', entities.get('keywords', ''))
+        keywords_text = entities.get('keywords', '')
         if keywords_text and isinstance(keywords_text, str):
             keywords = [k.strip() for k in keywords_text.split(',')]
-            for keyword in keywords[:10]:  # Limit to 10 keywords
-                query = """
-                MATCH (s:Abstract)
-                MERGE (k:Keyword {name: $keyword})
-                CREATE (s)-[:HAS_KEYWORD]->(k)
-                """
-                with self.driver.session() as session:
-                    session.run(query, keyword=keyword)
+            query = """
+            MATCH (s:Abstract)
+            UNWIND $rows AS keyword
+            MERGE (k:Keyword {name: keyword})
+            CREATE (s)-[:HAS_KEYWORD]->(k)
+            """
+            tx.run(query, rows=keywords[:10])  # Limit to 10 keywords
         
         print("✓ Abstract section loaded")
     
-    def load_introduction(self, paper_data):
+    def load_introduction(self, tx, intro):
         """Load introduction section with cancer types and symptoms"""
-        intro = paper_data['Sections']['Introduction']
         text = self.get_text(intro)
-        entities = intro.get('entities', intro.get('Entities', {}))
+        entities = self.get_entities(intro)
         
         # Create Introduction Section
         query = """
         MATCH (p:Paper)
         CREATE (s:Section:Introduction {
             name: 'Introduction',
-            text: $text
+            text: $text,
+            text_lower: toLower($text),
+            tokens: $tokens
         })
         CREATE (p)-[:HAS_SECTION]->(s)
         RETURN s
         """
         
-        with self.driver.session() as session:
-            session.run(query, text=text[:5000])  # Limit text length
+        text = text[:5000]  # Limit text length
+        tx.run(query, text=text, tokens=text_tokens(text))
         
         # Create Symptoms
-        symptoms = entities.get('Symptoms', [])
+        symptoms = entities.get('symptoms', [])
         if isinstance(symptoms, str):
             symptoms = [s.strip() for s in symptoms.split(',')]
         
-        for symptom in symptoms[:20]:  # Limit to 20
-            query = """
-            MATCH (s:Introduction)
-            MERGE (sym:Symptom {name: $symptom})
-            CREATE (s)-[:MENTIONS_SYMPTOM]->(sym)
-            """
-            with self.driver.session() as session:
-                session.run(query, symptom=symptom.strip())
+        query = """
+        MATCH (s:Introduction)
+        UNWIND $rows AS symptom
+        MERGE (sym:Symptom {name: symptom})
+        CREATE (s)-[:MENTIONS_SYMPTOM]->(sym)
+        """
+        tx.run(query, rows=[_INTERN(sym.strip()) for sym in symptoms[:20]])  # Limit to 20
         
         # Create Cancer Types
-        cancer_types = entities.get('Type of Cancer', entities.get('Types of Cancer', []))
+        cancer_types = entities.get('type of cancer', entities.get('types of cancer', []))
         if isinstance(cancer_types, str):
             cancer_types = [c.strip() for c in cancer_types.split(',')]
         
-        for cancer_type in cancer_types[:10]:  # Limit to 10
-            query = """
-            MATCH (s:Introduction)
-            MERGE (c:CancerType {name: $cancer_type})
-            CREATE (s)-[:DISCUSSES_CANCER_TYPE]->(c)
-            """
-            with self.driver.session() as session:
-                session.run(query, cancer_type=str(cancer_type).strip()[:100])
+        query = """
+        MATCH (s:Introduction)
+        UNWIND $rows AS cancer_type
+        MERGE (c:CancerType {name: cancer_type})
+        SET c.is_lung = cancer_type CONTAINS 'lung' OR cancer_type CONTAINS 'Lung'
+        CREATE (s)-[:DISCUSSES_CANCER_TYPE]->(c)
+        """
+        tx.run(query, rows=[str(c).strip()[:100] for c in cancer_types[:10]])  # Limit to 10
         
         # Create Diagnostic Techniques
-        techniques = entities.get('Common Diagnostic Techniques', [])
+        techniques = entities.get('common diagnostic techniques', [])
         if isinstance(techniques, str):
             techniques = [t.strip() for t in techniques.split(',')]
         
-        for technique in techniques[:10]:
-            query = """
-            MATCH (s:Introduction)
-            MERGE (t:Technique {name: $technique, type: 'diagnostic'})
-            CREATE (s)-[:USES_TECHNIQUE]->(t)
-            """
-            with self.driver.session() as session:
-                session.run(query, technique=technique.strip())
+        query = """
+        MATCH (s:Introduction)
+        UNWIND $rows AS technique
+        MERGE (t:Technique {name: technique, type: 'diagnostic'})
+        CREATE (s)-[:USES_TECHNIQUE]->(t)
+        """
+        tx.run(query, rows=[t.strip() for t in techniques[:10]])
         
         # Create Risk Factors (Habits)
-        habits = entities.get('Habits', [])
+        habits = entities.get('habits', [])
         if isinstance(habits, str):
             habits = [h.strip() for h in habits.split(',')]
         
-        for habit in habits[:10]:
-            query = """
-            MATCH (s:Introduction)
-            MERGE (r:RiskFactor {name: $habit})
-            CREATE (s)-[:IDENTIFIES_RISK_FACTOR]->(r)
-            """
-            with self.driver.session() as session:
-                session.run(query, habit=habit.strip())
+        query = """
+        MATCH (s:Introduction)
+        UNWIND $rows AS habit
+        MERGE (r:RiskFactor {name: habit})
+        CREATE (s)-[:IDENTIFIES_RISK_FACTOR]->(r)
+        """
+        tx.run(query, rows=[h.strip() for h in habits[:10]])
         
         print("✓ Introduction section loaded")
     
-    def load_methodology(self, paper_data):
+    def load_methodology(self, tx, methodology):
         """Load methodology section with dataset and models"""
-        methodology = paper_data['Sections'].get('Methodology', {})
         
         # Create Methodology Section
         method_text = self.get_text(methodology)
@@ -210,14 +221,16 @@ class LungCancerGraphLoader:
         MATCH (p:Paper)
         CREATE (s:Section:Methodology {
             name: 'Methodology',
-            text: $text
+            text: $text,
+            text_lower: toLower($text),
+            tokens: $tokens
         })
         CREATE (p)-[:HAS_SECTION]->(s)
         RETURN s
         """
         
-        with self.driver.session() as session:
-            session.run(query, text=method_text[:5000])
+        method_text = method_text[:5000]
+        tx.run(query, text=method_text, tokens=text_tokens(method_text))
         
         # Create Dataset node
         query = """
@@ -233,12 +246,11 @@ class LungCancerGraphLoader:
         RETURN d
         """
         
-        with self.driver.session() as session:
-            session.run(query)
+        tx.run(query)
         
         # Create Model nodes
-        entities = methodology.get('Entities', methodology.get('entities', {}))
-        models_list = entities.get('Proposed Models', [])
+        entities = self.get_entities(methodology)
+        models_list = entities.get('proposed models', [])
         
         if not models_list:
             models_list = [
@@ -248,59 +260,61 @@ class LungCancerGraphLoader:
                 'Multiple Linear Regression (MLR)'
             ]
         
+        models = []
         for model_name in models_list:
             # Extract short name
             if '(' in model_name and ')' in model_name:
-                short = model_name.split('(')[1].split(')')[0]
-                full = model_name.split('(')[0].strip()
+                short = _INTERN(model_name.split('(')[1].split(')')[0])
+                full = _INTERN(model_name.split('(')[0].strip())
             else:
-                short = model_name
-                full = model_name
-            
-            query = """
-            MATCH (s:Methodology)
-            CREATE (m:Model:Algorithm {
-                name: $name,
-                full_name: $full_name,
-                type: 'supervised'
-            })
-            CREATE (s)-[:IMPLEMENTS_MODEL]->(m)
-            """
-            with self.driver.session() as session:
-                session.run(query, name=short, full_name=full)
+                short = _INTERN(model_name)
+                full = short
+            models.append({'name': short, 'full_name': full})
+        
+        query = """
+        MATCH (s:Methodology)
+        UNWIND $rows AS row
+        CREATE (m:Model:Algorithm {
+            name: row.name,
+            full_name: row.full_name,
+            type: 'supervised'
+        })
+        CREATE (s)-[:IMPLEMENTS_MODEL]->(m)
+        """
+        tx.run(query, rows=models)
  
-        symptoms = entities.get('Symptoms', [])
+        symptoms = entities.get('symptoms', [])
         if isinstance(symptoms, str):
             symptoms = [s.strip() for s in symptoms.split(',')]
         
-        for symptom in symptoms[:20]:
-            query = """
-            MATCH (d:Dataset)
-            MERGE (f:Feature:Symptom {name: $symptom})
-            CREATE (d)-[:HAS_FEATURE]->(f)
-            """
-            with self.driver.session() as session:
-                session.run(query, symptom=symptom.strip())
+        query = """
+        MATCH (d:Dataset {name: 'Lung Cancer Dataset'})
+        UNWIND $rows AS symptom
+        MERGE (f:Feature:Symptom {name: symptom})
+        MERGE (d)-[:HAS_FEATURE]->(f)
+        """
+        tx.run(query, rows=[_INTERN(sym.strip()) for sym in symptoms[:20]])
         
         print("✓ Methodology section loaded")
     
-    def load_results(self, paper_data):
+    def load_results(self, tx, results):
         """Load results with model performance metrics"""
-        results = paper_data['Sections'].get('Results', {})
         
         results_text = self.get_text(results)
         query = """
         MATCH (p:Paper)
         CREATE (s:Section:Results {
             name: 'Results',
-            text: $text
+            text: $text,
+            text_lower: toLower($text),
+            tokens: $tokens
         })
         CREATE (p)-[:HAS_SECTION]->(s)
         RETURN s
         """
         
-        with self.driver.session() as session:
-            session.run(query, text=results_text[:5000])
+        results_text = results_text[:5000]
+        tx.run(query, text=results_text, tokens=text_tokens(results_text))
         
         performances = [
             {'model': 'ANN', 'accuracy': 65.75},
@@ -309,102 +323,141 @@ class LungCancerGraphLoader:
             {'model': 'SVM', 'accuracy': 98.91}
         ]
         
-        for perf in performances:
-            query = """
-            MATCH (m:Model)
-            WHERE m.name CONTAINS $model OR m.full_name CONTAINS $model
-            MATCH (s:Results)
-            CREATE (r:Result {
-                accuracy: $accuracy,
-                metric: 'Accuracy (%)',
-                evaluated_on: 'Test Set'
-            })
-            CREATE (m)-[:HAS_RESULT]->(r)
-            CREATE (s)-[:CONTAINS_RESULT]->(r)
-            """
-            with self.driver.session() as session:
-                session.run(query, model=perf['model'], accuracy=perf['accuracy'])
+        query = """
+        UNWIND $rows AS perf
+        MATCH (m:Model)
+        WHERE m.name CONTAINS perf.model OR m.full_name CONTAINS perf.model
+        MATCH (s:Results)
+        MERGE (r:Result {model_name: m.name, metric: 'Accuracy (%)'})
+        ON CREATE SET r.accuracy = perf.accuracy, r.evaluated_on = 'Test Set'
+        ON MATCH SET r.accuracy = perf.accuracy
+        MERGE (m)-[:HAS_RESULT]->(r)
+        MERGE (s)-[:CONTAINS_RESULT]->(r)
+        """
+        tx.run(query, rows=performances)
         
 
         query = """
         MATCH (m:Model)
         WHERE m.name CONTAINS 'Forest' OR m.full_name CONTAINS 'Forest'
         MATCH (p:Paper)
-        CREATE (p)-[:BEST_MODEL]->(m)
+        MERGE (p)-[:BEST_MODEL]->(m)
         """
-        with self.driver.session() as session:
-            session.run(query)
+        tx.run(query)
         
         print("✓ Results section loaded")
     
-    def load_conclusion(self, paper_data):
+    def load_conclusion(self, tx, conclusion):
         """Load conclusion section"""
-        conclusion = paper_data['Sections'].get('Conclusion', {})
         text = self.get_text(conclusion)
         
         query = """
         MATCH (p:Paper)
         CREATE (s:Section:Conclusion {
             name: 'Conclusion',
-            text: $text
+            text: $text,
+            text_lower: toLower($text),
+            tokens: $tokens
         })
         CREATE (p)-[:HAS_SECTION]->(s)
         RETURN s
         """
         
-        with self.driver.session() as session:
-            session.run(query, text=text[:5000])
+        text = text[:5000]
+        tx.run(query, text=text, tokens=text_tokens(text))
         
         print("✓ Conclusion section loaded")
     
-    def create_relationships(self):
+    def create_relationships(self, tx):
         """Create additional meaningful relationships"""
         
    
         query = """
+        MATCH (c:CancerType {is_lung: true})
         MATCH (s:Symptom)
-        MATCH (c:CancerType)
-        WHERE c.name CONTAINS 'lung' OR c.name CONTAINS 'Lung'
-        CREATE (s)-[:INDICATES]->(c)
+        MERGE (s)-[:INDICATES]->(c)
         """
-        with self.driver.session() as session:
-            session.run(query)
+        tx.run(query)
         
         query = """
+        MATCH (c:CancerType {is_lung: true})
         MATCH (r:RiskFactor)
-        MATCH (c:CancerType)
-        WHERE c.name CONTAINS 'lung' OR c.name CONTAINS 'Lung'
-        CREATE (r)-[:INCREASES_RISK_OF]->(c)
+        MERGE (r)-[:INCREASES_RISK_OF]->(c)
         """
-        with self.driver.session() as session:
-            session.run(query)
+        tx.run(query)
         
         print("✓ Additional relationships created")
     
+    def read_header(self, json_file):
+        """Stream the top-level paper fields, stopping before the sections"""
+        header = {}
+        key = builder = None
+        with open(json_file, 'rb') as f:
+            # Events of other keys (Sections included) are skipped, not built
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if prefix == '' and event in ('map_key', 'end_map'):
+                    # A top-level key (or the end of the file) closes the previous value
+                    if builder is not None:
+                        header[key] = builder.value
+                        builder = None
+                    if event == 'end_map' or len(header) == len(HEADER_KEYS):
+                        break
+                    if value in HEADER_KEYS:
+                        key, builder = value, ijson.ObjectBuilder()
+                elif builder is not None:
+                    builder.event(event, value)
+        
+        missing = [k for k in HEADER_KEYS if k not in header]
+        if missing:
+            raise ValueError(f"{json_file}: missing top-level field(s) {', '.join(missing)}")
+        return header
+    
+    def _load_graph(self, tx, header, json_file):
+        """Transaction function writing the whole graph in one commit"""
+        # Clear inside the same transaction so a bad file rolls the delete back too
+        self.clear_database(tx)
+        self.load_paper_metadata(tx, header)
+        
+        # Sections are streamed one at a time and loaded in dependency order;
+        # one that arrives early is held back until its predecessors are loaded.
+        loaders = {
+            'Abstract': self.load_abstract,
+            'Introduction': self.load_introduction,
+            'Methodology': self.load_methodology,
+            'Results': self.load_results,
+            'Conclusion': self.load_conclusion,
+        }
+        order = list(loaders)
+        pending = {}
+        with open(json_file, 'rb') as f:
+            for name, section in ijson.kvitems(f, 'Sections', use_float=True):
+                if name in loaders:
+                    pending[name] = section
+                while order and order[0] in pending:
+                    name = order.pop(0)
+                    loaders[name](tx, pending.pop(name))
+        
+        # Sections missing from the file are still created, with no text
+        for name in order:
+            loaders[name](tx, {})
+        
+        self.create_relationships(tx)
+    
     def load_all_data(self, json_file):
         """Main method to load all data from JSON file"""
         print("\n🚀 Starting data load process...")
         
    
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        print("✓ JSON file loaded")
-        
-        # Clear existing data
-        self.clear_database()
+        header = self.read_header(json_file)
+        print("✓ JSON header loaded")
         
         # Create constraints
         self.create_constraints()
         
-        # Load all sections
+        # Clear existing data and load all sections in a single write transaction
         try:
-            self.load_paper_metadata(data)
-            self.load_abstract(data)
-            self.load_introduction(data)
-            self.load_methodology(data)
-            self.load_results(data)
-            self.load_conclusion(data)
-            self.create_relationships()
+            with self.driver.session() as session:
+                session.execute_write(self._load_graph, header, json_file)
         except Exception as e:
             print(f"⚠️ Error during loading: {str(e)}")
             import traceback
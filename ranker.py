@@ -1,47 +1,73 @@
 import math
 import re
-from typing import Dict, List, Any
+from typing import Dict, FrozenSet, Iterable, List, Any, Sequence
+
+
+_TOK = re.compile(r"[a-zA-Z][a-zA-Z\-]{2,}")
+
+# Tags whose rows come from a structured graph lookup rather than free text.
+_STRUCTURED_TAGS = frozenset({"Symptoms","RiskFactors","DiagnosticTechniques","CancerTypes","Dataset","Results","Conclusion"})
 
 
 def _tokenize(text: str) -> List[str]:
-    return re.findall(r"[a-zA-Z][a-zA-Z\-]{2,}", (text or "").lower())
+    return _TOK.findall((text or "").lower())
 
 
-def lexical_overlap_score(question: str, text: str) -> float:
-    q_tokens = set(_tokenize(question))
-    t_tokens = set(_tokenize(text))
-    if not q_tokens or not t_tokens:
+def text_tokens(text: str) -> List[str]:
+    """Distinct tokens of a text, as stored on Section nodes at load time."""
+    return sorted(set(_tokenize(text)))
+
+
+def _lex(q_tokens: FrozenSet[str], q_len: int, t_tokens: Iterable[str]) -> float:
+    if not q_tokens:
         return 0.0
-    inter = len(q_tokens & t_tokens)
-    return inter / max(1, len(q_tokens))
+    # intersection() walks the row's tokens in C without building a set of them.
+    inter = len(q_tokens.intersection(t_tokens))
+    return inter / q_len
 
 
-def entity_match_boost(text: str, entities: Dict[str, List[str]]) -> float:
+def lexical_overlap_score(question: str, text: str) -> float:
+    q_tokens = frozenset(_tokenize(question))
+    return _lex(q_tokens, max(1, len(q_tokens)), _tokenize(text))
+
+
+def _ent(text: str, algorithms: Sequence[str], diseases: Sequence[str]) -> float:
     score = 0.0
     t = (text or "").lower()
-    for alg in entities.get("algorithms", []):
+    for alg in algorithms:
         if alg in t:
             score += 0.2
-    for dis in entities.get("diseases", []):
+    for dis in diseases:
         if dis in t:
             score += 0.2
     return min(score, 0.6)
 
 
+def entity_match_boost(text: str, entities: Dict[str, List[str]]) -> float:
+    return _ent(text, entities.get("algorithms", []), entities.get("diseases", []))
+
+
 def score_items(question: str, tag: str, rows: List[Dict[str, Any]], entities: Dict[str, List[str]]) -> List[Dict[str, Any]]:
-    scored: List[Dict[str, Any]] = []
+    # Question tokens and entity lists are the same for every row.
+    q_tokens = frozenset(_tokenize(question))
+    q_len = max(1, len(q_tokens))
+    algorithms = entities.get("algorithms", [])
+    diseases = entities.get("diseases", [])
+    prox = 0.2 if tag in _STRUCTURED_TAGS else 0.0
+
+    # Score into a flat list first, then argsort it; result dicts are only
+    # built once, already in rank order.
+    scores: List[float] = []
     for r in rows:
         text = r.get("text") or r.get("item") or r.get("model") or ""
-        lex = lexical_overlap_score(question, text)
-        ent = entity_match_boost(text, entities)
-        prox = 0.2 if tag in {"Symptoms","RiskFactors","DiagnosticTechniques","CancerTypes","Dataset","Results","Conclusion"} else 0.0
-        final = 0.5 * lex + 0.3 * ent + 0.2 * prox
-        r_scored = dict(r)
-        r_scored["_score"] = final
-        r_scored["_tag"] = tag
-        scored.append(r_scored)
-    scored.sort(key=lambda x: x["_score"], reverse=True)
-    return scored
+        # Section rows carry their tokens precomputed by the loader.
+        t_tokens = r.get("tokens")
+        lex = _lex(q_tokens, q_len, _tokenize(text) if t_tokens is None else t_tokens)
+        ent = _ent(text, algorithms, diseases)
+        scores.append(0.5 * lex + 0.3 * ent + 0.2 * prox)
+
+    order = sorted(range(len(rows)), key=scores.__getitem__, reverse=True)
+    return [dict(rows[i], _score=scores[i], _tag=tag) for i in order]
 
 
 def select_top_n(scored_items: List[Dict[str, Any]], n: int = 8) -> List[Dict[str, Any]]: